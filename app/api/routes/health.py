@@ -3,35 +3,63 @@ Health check routes.
 Provides endpoints to monitor API and database health.
 """
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+import time
+
+from fastapi import APIRouter, Depends, Response
+from fastapi_cache.decorator import cache
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 from datetime import datetime
 
 from app.database.session import get_db
-from app.schemas.task import HealthResponse, DetailedHealthResponse
+from app.schemas.task import DetailedHealthResponse
 from app.config import settings
 
 router = APIRouter(tags=["Health"])
 
+# Database ping result, cached briefly so frequent probes don't each
+# consume a pooled connection and a round trip.
+_PING_TTL_SECONDS = 5.0
+_last_ping: tuple[float, str] = (0.0, "")
+
+
+async def _database_status(db: AsyncSession) -> str:
+    """Return the database connectivity status, re-pinging at most every 5s."""
+    global _last_ping
+
+    checked_at, cached_status = _last_ping
+    if cached_status and time.monotonic() - checked_at < _PING_TTL_SECONDS:
+        return cached_status
+
+    try:
+        await db.execute(text("SELECT 1"))
+        db_status = "connected"
+    except Exception as e:
+        db_status = f"error: {str(e)}"
+
+    _last_ping = (time.monotonic(), db_status)
+    return db_status
+
 
 @router.get(
     "/health",
-    response_model=HealthResponse,
+    response_model=None,
     summary="Basic health check",
     description="Simple health check to verify API is running"
 )
-def health_check() -> HealthResponse:
+async def health_check() -> Response:
     """
     Basic health check endpoint.
-    
+
+    Sits on the liveness-probe hot path, so the body is assembled as raw
+    bytes with a nanosecond epoch timestamp: no datetime allocation and
+    no response-model validation per probe.
+
     Returns:
         Status and timestamp
     """
-    return HealthResponse(
-        status="healthy",
-        timestamp=datetime.utcnow()
-    )
+    body = b'{"status":"healthy","timestamp":%d}' % time.time_ns()
+    return Response(content=body, media_type="application/json")
 
 
 @router.get(
@@ -40,7 +68,8 @@ def health_check() -> HealthResponse:
     summary="Detailed health check",
     description="Detailed health check including database connectivity"
 )
-def detailed_health_check(db: Session = Depends(get_db)) -> DetailedHealthResponse:
+@cache(expire=settings.cache_ttl)
+async def detailed_health_check(db: AsyncSession = Depends(get_db)) -> DetailedHealthResponse:
     """
     Detailed health check with database status.
     
@@ -52,13 +81,8 @@ def detailed_health_check(db: Session = Depends(get_db)) -> DetailedHealthRespon
     Returns:
         Detailed health information
     """
-    # Check database connection
-    try:
-        db.execute(text("SELECT 1"))
-        db_status = "connected"
-    except Exception as e:
-        db_status = f"error: {str(e)}"
-    
+    db_status = await _database_status(db)
+
     return DetailedHealthResponse(
         status="healthy",
         timestamp=datetime.utcnow(),
@@ -3,21 +3,133 @@ Task API routes.
 Defines all task-related endpoints.
 """
 
+import orjson
 from fastapi import APIRouter, Depends, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from fastapi_cache.decorator import cache
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, AsyncIterator, List, Optional
 
 from app.database.session import get_db
 from app.schemas.task import (
-    TaskCreate, TaskUpdate, TaskResponse, TaskListResponse,
+    TaskCreate, TaskUpdate, TaskResponse,
     TaskStatusUpdate, TaskPriorityUpdate, MessageResponse
 )
-from app.services.task_service import TaskService
-from app.models.task import TaskStatus, TaskPriority
+from app.services.task_service import TaskService, encode_cursor
+from app.utils.cache import invalidate_cache, params_key_builder
+from app.models.task import Task, TaskStatus, TaskPriority
 from app.config import settings
 
 router = APIRouter(prefix="/api/v1/tasks", tags=["Tasks"])
 
+# Captured once at import time so request dispatch reads plain module
+# constants instead of going through the Settings proxy on every call.
+_DEFAULT_PAGE_SIZE = settings.default_page_size
+_MAX_PAGE_SIZE = settings.max_page_size
+
+# Above this many rows, list responses are streamed chunk by chunk
+# instead of being materialized (and cached) in one piece.
+_STREAM_THRESHOLD = 200
+
+_TASK_COLUMNS = tuple(c.name for c in Task.__table__.columns)
+
+
+def _task_row(task: Task) -> dict:
+    return {name: getattr(task, name) for name in _TASK_COLUMNS}
+
+
+def _stream_list_response(
+    tasks: AsyncIterator[Task],
+    total: Optional[int],
+    skip: int,
+    limit: int
+) -> StreamingResponse:
+    """Serialize a task stream as a TaskListResponse-shaped JSON body."""
+
+    async def body():
+        yield b'{"tasks":['
+        first = True
+        count = 0
+        last_task = None
+        async for task in tasks:
+            if first:
+                first = False
+            else:
+                yield b","
+            yield orjson.dumps(_task_row(task))
+            count += 1
+            last_task = task
+        # A full page may have more rows behind it; hand back a cursor
+        # so large pages can be continued without offset pagination.
+        next_cursor = encode_cursor(last_task) if count == limit else None
+        # Splice the trailing fields onto the closing bracket
+        tail = orjson.dumps({
+            "total": total,
+            "skip": skip,
+            "limit": limit,
+            "next_cursor": next_cursor
+        })
+        yield b"]," + tail[1:]
+
+    return StreamingResponse(body(), media_type="application/json")
+
+
+def _page_response(page: Any) -> ORJSONResponse:
+    """
+    Wrap a cached helper's result as a response.
+
+    On a cache miss the helper returns the ORJSONResponse itself (the
+    cache stores its serialized body); on a hit the coder hands back the
+    decoded dict, which only needs re-wrapping.
+    """
+    if isinstance(page, ORJSONResponse):
+        return page
+    return ORJSONResponse(page)
+
+
+@cache(expire=settings.cache_ttl, key_builder=params_key_builder)
+async def _list_tasks_cached(
+    *,
+    skip: int,
+    limit: int,
+    status: Optional[TaskStatus],
+    priority: Optional[TaskPriority],
+    with_total: bool,
+    cursor: Optional[str],
+    db: AsyncSession
+) -> ORJSONResponse:
+    tasks, total, next_cursor = await TaskService.get_tasks(
+        db, skip, limit, status, priority, with_total, cursor
+    )
+
+    return ORJSONResponse({
+        "tasks": [_task_row(task) for task in tasks],
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": next_cursor
+    })
+
+
+@cache(expire=settings.cache_ttl, key_builder=params_key_builder)
+async def _search_tasks_cached(
+    *,
+    q: str,
+    skip: int,
+    limit: int,
+    with_total: bool,
+    db: AsyncSession
+) -> ORJSONResponse:
+    tasks, total = await TaskService.search_tasks(db, q, skip, limit, with_total)
+
+    return ORJSONResponse({
+        "tasks": [_task_row(task) for task in tasks],
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": None
+    })
+
 
 @router.post(
     "",
@@ -26,9 +138,9 @@ router = APIRouter(prefix="/api/v1/tasks", tags=["Tasks"])
     summary="Create a new task",
     description="Create a new task with title, description, priority, status, and due date"
 )
-def create_task(
+async def create_task(
     task: TaskCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> TaskResponse:
     """
     Create a new task.
@@ -39,73 +151,111 @@ def create_task(
     - **priority**: low, medium, or high (default: medium)
     - **due_date**: Due date in YYYY-MM-DD format (optional)
     """
-    created_task = TaskService.create_task(db, task)
+    created_task = await TaskService.create_task(db, task)
+    await invalidate_cache()
     return created_task
 
 
+@router.post(
+    "/bulk",
+    response_model=List[TaskResponse],
+    status_code=status.HTTP_201_CREATED,
+    summary="Create multiple tasks",
+    description="Create many tasks in a single request and database round trip"
+)
+async def bulk_create_tasks(
+    tasks: List[TaskCreate],
+    db: AsyncSession = Depends(get_db)
+) -> List[TaskResponse]:
+    """
+    Create multiple tasks at once.
+
+    - Accepts a JSON array of task objects (same shape as POST /tasks)
+    - All tasks are inserted in one statement and one transaction
+    """
+    created_tasks = await TaskService.bulk_create_tasks(db, tasks)
+    await invalidate_cache()
+    return created_tasks
+
+
 @router.get(
     "",
-    response_model=TaskListResponse,
+    response_model=None,
     summary="Get all tasks",
     description="Retrieve a list of tasks with optional filtering and pagination"
 )
-def get_tasks(
-    skip: int = Query(0, ge=0, description="Number of tasks to skip"),
+async def get_tasks(
+    skip: int = Query(
+        0, ge=0, deprecated=True,
+        description="Number of tasks to skip (prefer cursor pagination)"
+    ),
     limit: int = Query(
-        settings.default_page_size,
+        _DEFAULT_PAGE_SIZE,
         ge=1,
-        le=settings.max_page_size,
+        le=_MAX_PAGE_SIZE,
         description="Maximum number of tasks to return"
     ),
     status: Optional[TaskStatus] = Query(None, description="Filter by status"),
     priority: Optional[TaskPriority] = Query(None, description="Filter by priority"),
-    db: Session = Depends(get_db)
-) -> TaskListResponse:
+    with_total: bool = Query(False, description="Also count all matching tasks"),
+    cursor: Optional[str] = Query(
+        None, description="Keyset cursor from a previous page's next_cursor"
+    ),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Get all tasks with optional filtering.
     
-    - **skip**: Number of tasks to skip (for pagination)
+    - **skip**: Number of tasks to skip (deprecated; gets slower on deep pages)
     - **limit**: Maximum tasks to return (default: 100, max: 1000)
     - **status**: Filter by status (pending, in_progress, completed)
     - **priority**: Filter by priority (low, medium, high)
+    - **with_total**: Include the total match count (extra COUNT query)
+    - **cursor**: Opaque cursor from the previous page; O(1) at any depth
+
+    Large pages (limit above 200) are streamed row by row; smaller ones
+    are served from the response cache.
     """
-    tasks, total = TaskService.get_tasks(db, skip, limit, status, priority)
-    
-    return TaskListResponse(
-        tasks=tasks,
-        total=total,
-        skip=skip,
-        limit=limit
-    )
+    if limit > _STREAM_THRESHOLD:
+        tasks, total = await TaskService.stream_tasks(
+            db, skip, limit, status, priority, with_total, cursor
+        )
+        return _stream_list_response(tasks, total, skip, limit)
+
+    return _page_response(await _list_tasks_cached(
+        skip=skip, limit=limit, status=status, priority=priority,
+        with_total=with_total, cursor=cursor, db=db
+    ))
 
 
 @router.get(
     "/search",
-    response_model=TaskListResponse,
+    response_model=None,
     summary="Search tasks",
     description="Search tasks by title or description"
 )
-def search_tasks(
+async def search_tasks(
     q: str = Query(..., min_length=1, description="Search query"),
     skip: int = Query(0, ge=0),
-    limit: int = Query(settings.default_page_size, ge=1, le=settings.max_page_size),
-    db: Session = Depends(get_db)
-) -> TaskListResponse:
+    limit: int = Query(_DEFAULT_PAGE_SIZE, ge=1, le=_MAX_PAGE_SIZE),
+    with_total: bool = Query(False, description="Also count all matching tasks"),
+    db: AsyncSession = Depends(get_db)
+):
     """
     Search tasks by title or description.
     
     - **q**: Search query (searches in title and description)
     - **skip**: Number of tasks to skip
     - **limit**: Maximum tasks to return
+    - **with_total**: Include the total match count (extra COUNT query)
     """
-    tasks, total = TaskService.search_tasks(db, q, skip, limit)
-    
-    return TaskListResponse(
-        tasks=tasks,
-        total=total,
-        skip=skip,
-        limit=limit
-    )
+    if limit > _STREAM_THRESHOLD:
+        tasks, total = await TaskService.stream_search(db, q, skip, limit, with_total)
+        return _stream_list_response(tasks, total, skip, limit)
+
+    return _page_response(await _search_tasks_cached(
+        q=q, skip=skip, limit=limit, with_total=with_total, db=db
+    ))
 
 
 @router.get(
@@ -113,32 +263,33 @@ def search_tasks(
     summary="Get task statistics",
     description="Get statistics about tasks (counts by status and priority)"
 )
-def get_task_statistics(
-    db: Session = Depends(get_db)
+@cache(expire=settings.cache_ttl)
+async def get_task_statistics(
+    db: AsyncSession = Depends(get_db)
 ) -> dict:
     """
     Get task statistics including counts by status and priority.
     """
-    return TaskService.get_task_statistics(db)
+    return await TaskService.get_task_statistics(db)
 
 
 @router.get(
     "/{task_id}",
-    response_model=TaskResponse,
+    response_model=None,
     summary="Get task by ID",
     description="Retrieve a specific task by its ID"
 )
-def get_task(
+async def get_task(
     task_id: int,
-    db: Session = Depends(get_db)
-) -> TaskResponse:
+    db: AsyncSession = Depends(get_db)
+) -> ORJSONResponse:
     """
     Get a specific task by ID.
-    
+
     - **task_id**: Unique task identifier
     """
-    task = TaskService.get_task(db, task_id)
-    return task
+    task = await TaskService.get_task(db, task_id)
+    return ORJSONResponse(_task_row(task))
 
 
 @router.put(
@@ -147,10 +298,10 @@ def get_task(
     summary="Update task",
     description="Update a task (all fields)"
 )
-def update_task(
+async def update_task(
     task_id: int,
     task_update: TaskUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> TaskResponse:
     """
     Update a task completely.
@@ -158,7 +309,8 @@ def update_task(
     - **task_id**: Task to update
     - Provide any fields you want to update
     """
-    updated_task = TaskService.update_task(db, task_id, task_update)
+    updated_task = await TaskService.update_task(db, task_id, task_update)
+    await invalidate_cache()
     return updated_task
 
 
@@ -168,10 +320,10 @@ def update_task(
     summary="Partially update task",
     description="Update specific fields of a task"
 )
-def partial_update_task(
+async def partial_update_task(
     task_id: int,
     task_update: TaskUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> TaskResponse:
     """
     Partially update a task.
@@ -179,7 +331,8 @@ def partial_update_task(
     - **task_id**: Task to update
     - Only provide the fields you want to change
     """
-    updated_task = TaskService.update_task(db, task_id, task_update)
+    updated_task = await TaskService.update_task(db, task_id, task_update)
+    await invalidate_cache()
     return updated_task
 
 
@@ -189,10 +342,10 @@ def partial_update_task(
     summary="Update task status",
     description="Update only the status of a task"
 )
-def update_task_status(
+async def update_task_status(
     task_id: int,
     status_update: TaskStatusUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> TaskResponse:
     """
     Update task status only.
@@ -200,7 +353,8 @@ def update_task_status(
     - **task_id**: Task to update
     - **status**: New status (pending, in_progress, completed)
     """
-    updated_task = TaskService.update_task_status(db, task_id, status_update.status)
+    updated_task = await TaskService.update_task_status(db, task_id, status_update.status)
+    await invalidate_cache()
     return updated_task
 
 
@@ -210,10 +364,10 @@ def update_task_status(
     summary="Update task priority",
     description="Update only the priority of a task"
 )
-def update_task_priority(
+async def update_task_priority(
     task_id: int,
     priority_update: TaskPriorityUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> TaskResponse:
     """
     Update task priority only.
@@ -221,7 +375,8 @@ def update_task_priority(
     - **task_id**: Task to update
     - **priority**: New priority (low, medium, high)
     """
-    updated_task = TaskService.update_task_priority(db, task_id, priority_update.priority)
+    updated_task = await TaskService.update_task_priority(db, task_id, priority_update.priority)
+    await invalidate_cache()
     return updated_task
 
 
@@ -231,14 +386,15 @@ def update_task_priority(
     summary="Delete task",
     description="Delete a task permanently"
 )
-def delete_task(
+async def delete_task(
     task_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> None:
     """
     Delete a task permanently.
     
     - **task_id**: Task to delete
     """
-    TaskService.delete_task(db, task_id)
+    await TaskService.delete_task(db, task_id)
+    await invalidate_cache()
     return None
@@ -3,25 +3,43 @@ Configuration module for Task Management API.
 Handles environment variables and application settings.
 """
 
+from functools import lru_cache
+
+from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 import os
 
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables."""
-    
+
     # Application
     app_name: str = "Task Management API"
     app_version: str = "1.0.0"
     debug: bool = True
-    
+
     # Server
     host: str = "0.0.0.0"
     port: int = 8000
+    workers: int = Field(
+        1, validation_alias=AliasChoices("workers", "web_concurrency")
+    )
+    loop: str = "uvloop"
+    http: str = "httptools"
     
     # Database
     database_url: str = "sqlite:///./tasks.db"
+
+    # Response cache
+    redis_url: Optional[str] = None
+    cache_ttl: int = 30
+
+    # Connection pool (ignored for SQLite)
+    pool_size: int = 20
+    max_overflow: int = 10
+    pool_timeout: int = 30
+    pool_recycle: int = 3600
     
     # CORS
     cors_origins: List[str] = [
@@ -40,5 +58,11 @@ class Settings(BaseSettings):
         case_sensitive = False
 
 
+@lru_cache
+def get_settings() -> Settings:
+    """Return the application settings, constructed exactly once."""
+    return Settings()
+
+
 # Create global settings instance
-settings = Settings()
+settings = get_settings()
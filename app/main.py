@@ -5,7 +5,7 @@ Configures and runs the Task Management API.
 
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.exceptions import RequestValidationError
 import logging
 from contextlib import asynccontextmanager
@@ -13,6 +13,7 @@ from contextlib import asynccontextmanager
 from app.config import settings
 from app.database.session import create_tables
 from app.api.routes import tasks, health
+from app.utils.cache import init_cache
 from app.utils.exceptions import TaskNotFoundException, TaskValidationException
 
 # Configure logging
@@ -34,7 +35,7 @@ async def lifespan(app: FastAPI):
     logger.info(f"Debug mode: {settings.debug}")
     
     # Create database tables
-    create_tables()
+    await create_tables()
     logger.info("Database tables created/verified")
     
     yield
@@ -68,11 +69,15 @@ app = FastAPI(
     * **Due Date** - Optional deadline
     """,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json"
 )
 
+# Set up the response cache for the read endpoints
+init_cache()
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -87,7 +92,7 @@ app.add_middleware(
 @app.exception_handler(TaskNotFoundException)
 async def task_not_found_handler(request: Request, exc: TaskNotFoundException):
     """Handle task not found exceptions."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail}
     )
@@ -96,7 +101,7 @@ async def task_not_found_handler(request: Request, exc: TaskNotFoundException):
 @app.exception_handler(TaskValidationException)
 async def task_validation_handler(request: Request, exc: TaskValidationException):
     """Handle task validation exceptions."""
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=exc.status_code,
         content={"detail": exc.detail}
     )
@@ -118,7 +123,7 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle general exceptions."""
     logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         content={"detail": "Internal server error"}
     )
@@ -151,5 +156,8 @@ if __name__ == "__main__":
         "app.main:app",
         host=settings.host,
         port=settings.port,
-        reload=settings.debug
+        workers=settings.workers,
+        loop=settings.loop,
+        http=settings.http,
+        reload=settings.debug and settings.workers == 1
     )
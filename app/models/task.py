@@ -3,7 +3,9 @@ Task database model.
 Defines the Task table structure using SQLAlchemy ORM.
 """
 
-from sqlalchemy import Column, Integer, String, Text, Enum, Date, DateTime
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, DDL, Index, SmallInteger, event
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.types import TypeDecorator
 from sqlalchemy.sql import func
 import enum
 from app.database.session import Base
@@ -23,6 +25,50 @@ class TaskPriority(str, enum.Enum):
     HIGH = "high"
 
 
+class IntEnumType(TypeDecorator):
+    """
+    Store a string enum as a SMALLINT.
+
+    Narrower than a native enum column (no catalog lookup, more rows per
+    page on grouped scans) and adding members never needs ALTER TYPE.
+    The integer codes are part of the on-disk format: never renumber them.
+    """
+
+    impl = SmallInteger
+    cache_ok = True
+
+    def __init__(self, enum_class, codes: dict, **kwargs):
+        super().__init__(**kwargs)
+        self.enum_class = enum_class
+        self._to_int = codes
+        self._from_int = {code: member for member, code in codes.items()}
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, self.enum_class):
+            value = self.enum_class(value)
+        return self._to_int[value]
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return self._from_int[value]
+
+
+_STATUS_CODES = {
+    TaskStatus.PENDING: 0,
+    TaskStatus.IN_PROGRESS: 1,
+    TaskStatus.COMPLETED: 2,
+}
+
+_PRIORITY_CODES = {
+    TaskPriority.LOW: 0,
+    TaskPriority.MEDIUM: 1,
+    TaskPriority.HIGH: 2,
+}
+
+
 class Task(Base):
     """
     Task model representing a task in the database.
@@ -44,20 +90,90 @@ class Task(Base):
     title = Column(String(200), nullable=False, index=True)
     description = Column(Text, nullable=True)
     status = Column(
-        Enum(TaskStatus),
+        IntEnumType(TaskStatus, _STATUS_CODES),
         default=TaskStatus.PENDING,
-        nullable=False,
-        index=True
+        nullable=False
     )
     priority = Column(
-        Enum(TaskPriority),
+        IntEnumType(TaskPriority, _PRIORITY_CODES),
         default=TaskPriority.MEDIUM,
-        nullable=False,
-        index=True
+        nullable=False
     )
     due_date = Column(Date, nullable=True, index=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # The SQLite variant drops microseconds so bound comparisons render in
+    # the same second-precision format CURRENT_TIMESTAMP stores (keyset
+    # pagination compares against this column).
+    created_at = Column(
+        DateTime(timezone=True).with_variant(
+            sqlite.DATETIME(truncate_microseconds=True), "sqlite"
+        ),
+        server_default=func.now(),
+        nullable=False
+    )
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
-    
+
     def __repr__(self):
         return f"<Task(id={self.id}, title='{self.title}', status={self.status.value})>"
+
+
+# Composite index matching the keyset pagination order, so cursor pages
+# start with an index range scan regardless of depth.
+Index("ix_tasks_created_at_id", Task.created_at.desc(), Task.id.desc())
+
+# Composite index matching how listings actually filter and sort
+# (status AND priority, ordered by recency); it replaces the old
+# single-column status/priority indexes, which the planner could only
+# use one of.
+Index(
+    "ix_tasks_status_prio_created",
+    Task.status,
+    Task.priority,
+    Task.created_at.desc(),
+)
+
+
+# PostgreSQL full-text search support: a generated tsvector column over
+# title + description with a GIN index, so search is an inverted-index
+# lookup instead of a sequential ILIKE scan. SQLite keeps the ILIKE path.
+# The column is deliberately not mapped on the model so the ORM never
+# tries to insert, fetch, or create it on backends that lack it.
+event.listen(
+    Task.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE tasks ADD COLUMN search_vec tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('english', "
+        "coalesce(title, '') || ' ' || coalesce(description, ''))) STORED"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Task.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX tasks_search_gin ON tasks USING GIN (search_vec)"
+    ).execute_if(dialect="postgresql"),
+)
+
+# Trigram indexes let substring ILIKE patterns ('%foo%') use an index
+# instead of a sequential scan, covering the short/partial queries that
+# plainto_tsquery stems away.
+event.listen(
+    Task.__table__,
+    "after_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+event.listen(
+    Task.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX ix_tasks_title_trgm ON tasks USING GIN (title gin_trgm_ops)"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Task.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX ix_tasks_desc_trgm ON tasks "
+        "USING GIN (description gin_trgm_ops)"
+    ).execute_if(dialect="postgresql"),
+)
@@ -58,9 +58,12 @@ class TaskListResponse(BaseModel):
     """Schema for list of tasks response."""
     
     tasks: list[TaskResponse] = Field(..., description="List of tasks")
-    total: int = Field(..., description="Total number of tasks")
+    total: Optional[int] = Field(None, description="Total number of tasks (only when requested)")
     skip: int = Field(..., description="Number of tasks skipped")
     limit: int = Field(..., description="Maximum tasks returned")
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page (present when more rows may exist)"
+    )
 
 
 class HealthResponse(BaseModel):
@@ -3,25 +3,124 @@ Task service module.
 Contains business logic for task operations.
 """
 
-from sqlalchemy.orm import Session
-from typing import List, Optional
+import base64
+import binascii
+from datetime import datetime
+
+import orjson
+from sqlalchemy import column, delete, func, insert, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Optional
 from app.models.task import Task, TaskStatus, TaskPriority
 from app.schemas.task import TaskCreate, TaskUpdate
 from app.utils.exceptions import TaskNotFoundException, TaskValidationException
 
 
+# Rows fetched per round trip when streaming large result sets
+STREAM_CHUNK_SIZE = 200
+
+# Columns a client may set through the update endpoints, computed once so
+# the update path screens field names with a frozenset lookup instead of
+# consulting the mapper per request.
+_UPDATABLE_FIELDS = frozenset(
+    ("title", "description", "status", "priority", "due_date")
+)
+
+# Escapes LIKE wildcards in user-supplied search text, compiled once;
+# without it a query containing % or _ silently matches everything.
+_LIKE_ESC_TABLE = str.maketrans({"%": "\\%", "_": "\\_", "\\": "\\\\"})
+
+
+def encode_cursor(task: Task) -> str:
+    """Encode a task's (created_at, id) pagination position as an opaque cursor."""
+    return base64.urlsafe_b64encode(
+        orjson.dumps([task.created_at.isoformat(), task.id])
+    ).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decode a pagination cursor back to its (created_at, id) position.
+
+    Raises:
+        TaskValidationException: If the cursor is malformed
+    """
+    try:
+        created_at, task_id = orjson.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(created_at), int(task_id)
+    except (ValueError, TypeError, binascii.Error, orjson.JSONDecodeError):
+        raise TaskValidationException("Invalid pagination cursor")
+
+
 class TaskService:
     """Service class for task-related operations."""
-    
+
+    @staticmethod
+    def _filter_stmt(
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None,
+        cursor: Optional[str] = None
+    ):
+        """Build the filtered SELECT shared by listing and streaming."""
+        stmt = select(Task)
+
+        if status:
+            stmt = stmt.where(Task.status == status)
+
+        if priority:
+            stmt = stmt.where(Task.priority == priority)
+
+        if cursor:
+            # Keyset pagination: start the scan right after the cursor row
+            # instead of discarding `skip` rows.
+            created_at, task_id = decode_cursor(cursor)
+            stmt = stmt.where(
+                tuple_(Task.created_at, Task.id) < (created_at, task_id)
+            )
+
+        return stmt
+
     @staticmethod
-    def create_task(db: Session, task_data: TaskCreate) -> Task:
+    def _search_stmt(db: AsyncSession, query: str):
+        """Build the search SELECT shared by searching and streaming."""
+        pattern = f"%{query.translate(_LIKE_ESC_TABLE)}%"
+        substring_filter = (
+            Task.title.ilike(pattern, escape="\\") |
+            Task.description.ilike(pattern, escape="\\")
+        )
+
+        if db.get_bind().dialect.name == "postgresql":
+            # Full-text search against the generated tsvector column
+            # (unmapped, see app/models/task.py), served by the GIN index.
+            # The substring match complements it for short or partial
+            # terms that plainto_tsquery stems away or drops entirely;
+            # the pg_trgm indexes keep that branch off a sequential scan
+            # and the planner bitmap-ORs the index results.
+            search_filter = column("search_vec").op("@@")(
+                func.plainto_tsquery("english", query)
+            ) | substring_filter
+        else:
+            # No FTS column here; substring match only.
+            search_filter = substring_filter
+
+        return select(Task).where(search_filter)
+
+    @staticmethod
+    async def _count(db: AsyncSession, stmt) -> int:
+        """Count the rows a filtered SELECT would return."""
+        return await db.scalar(
+            select(func.count()).select_from(stmt.subquery())
+        )
+
+    @staticmethod
+    async def create_task(db: AsyncSession, task_data: TaskCreate) -> Task:
         """
         Create a new task.
-        
+
         Args:
             db: Database session
             task_data: Task creation data
-            
+
         Returns:
             Created task
         """
@@ -32,222 +131,374 @@ class TaskService:
             priority=task_data.priority,
             due_date=task_data.due_date
         )
-        
+
         db.add(task)
-        db.commit()
-        db.refresh(task)
-        
+        await db.commit()
+        await db.refresh(task)
+
         return task
-    
+
     @staticmethod
-    def get_task(db: Session, task_id: int) -> Task:
+    async def bulk_create_tasks(db: AsyncSession, items: List[TaskCreate]) -> List[Task]:
+        """
+        Create many tasks in a single INSERT.
+
+        One round trip and one planner invocation for the whole batch,
+        instead of one INSERT per row.
+
+        Args:
+            db: Database session
+            items: Task creation data, one entry per task
+
+        Returns:
+            Created tasks, in input order
+        """
+        # executemany with no parameter sets degrades to a single
+        # defaults-only INSERT, which violates NOT NULL on title
+        if not items:
+            return []
+
+        rows = await db.scalars(
+            insert(Task).returning(Task, sort_by_parameter_order=True),
+            [item.model_dump() for item in items]
+        )
+        tasks = list(rows.all())
+        await db.commit()
+
+        return tasks
+
+    @staticmethod
+    async def get_task(db: AsyncSession, task_id: int) -> Task:
         """
         Get a task by ID.
-        
+
         Args:
             db: Database session
             task_id: Task ID
-            
+
         Returns:
             Task object
-            
+
         Raises:
             TaskNotFoundException: If task not found
         """
-        task = db.query(Task).filter(Task.id == task_id).first()
-        
+        task = await db.get(Task, task_id)
+
         if not task:
             raise TaskNotFoundException(task_id)
-        
+
         return task
-    
+
     @staticmethod
-    def get_tasks(
-        db: Session,
+    async def get_tasks(
+        db: AsyncSession,
         skip: int = 0,
         limit: int = 100,
         status: Optional[TaskStatus] = None,
-        priority: Optional[TaskPriority] = None
-    ) -> tuple[List[Task], int]:
+        priority: Optional[TaskPriority] = None,
+        with_total: bool = False,
+        cursor: Optional[str] = None
+    ) -> tuple[List[Task], Optional[int], Optional[str]]:
         """
         Get list of tasks with optional filtering.
-        
+
         Args:
             db: Database session
-            skip: Number of records to skip
+            skip: Number of records to skip (ignored when cursor is given)
             limit: Maximum records to return
             status: Filter by status
             priority: Filter by priority
-            
+            with_total: Whether to also count matching rows
+            cursor: Keyset pagination cursor from a previous page
+
         Returns:
-            Tuple of (tasks list, total count)
+            Tuple of (tasks list, total count or None, next page cursor or None)
         """
-        query = db.query(Task)
-        
-        # Apply filters
-        if status:
-            query = query.filter(Task.status == status)
-        
-        if priority:
-            query = query.filter(Task.priority == priority)
-        
-        # Get total count
-        total = query.count()
-        
+        stmt = TaskService._filter_stmt(status, priority, cursor)
+
+        # Counting costs as much as the filter scan itself, so only do it
+        # when the client asked for it. Count without the cursor
+        # predicate so total means the full filtered count on every
+        # page, exactly as it does for offset pagination.
+        total = None
+        if with_total:
+            total = await TaskService._count(
+                db, TaskService._filter_stmt(status, priority)
+            )
+
         # Apply pagination
-        tasks = query.order_by(Task.created_at.desc()).offset(skip).limit(limit).all()
-        
-        return tasks, total
-    
+        stmt = stmt.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit)
+        if not cursor:
+            stmt = stmt.offset(skip)
+
+        result = await db.execute(stmt)
+        tasks = list(result.scalars().all())
+
+        next_cursor = None
+        if len(tasks) == limit and tasks:
+            next_cursor = encode_cursor(tasks[-1])
+
+        return tasks, total, next_cursor
+
     @staticmethod
-    def update_task(db: Session, task_id: int, task_data: TaskUpdate) -> Task:
+    async def stream_tasks(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[TaskStatus] = None,
+        priority: Optional[TaskPriority] = None,
+        with_total: bool = False,
+        cursor: Optional[str] = None
+    ) -> tuple[AsyncIterator[Task], Optional[int]]:
+        """
+        Stream tasks instead of materializing them.
+
+        Rows come off the cursor STREAM_CHUNK_SIZE at a time, so peak
+        memory is bounded by the chunk size rather than the limit.
+
+        Args:
+            db: Database session
+            skip: Number of records to skip (ignored when cursor is given)
+            limit: Maximum records to return
+            status: Filter by status
+            priority: Filter by priority
+            with_total: Whether to also count matching rows
+            cursor: Keyset pagination cursor from a previous page
+
+        Returns:
+            Tuple of (async task iterator, total count or None)
+        """
+        stmt = TaskService._filter_stmt(status, priority, cursor)
+
+        # Count without the cursor predicate: total is the full filtered
+        # count on every page, matching get_tasks.
+        total = None
+        if with_total:
+            total = await TaskService._count(
+                db, TaskService._filter_stmt(status, priority)
+            )
+
+        stmt = stmt.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit)
+        if not cursor:
+            stmt = stmt.offset(skip)
+
+        result = await db.stream(
+            stmt.execution_options(yield_per=STREAM_CHUNK_SIZE)
+        )
+
+        return result.scalars(), total
+
+    @staticmethod
+    async def update_task(db: AsyncSession, task_id: int, task_data: TaskUpdate) -> Task:
         """
         Update a task.
-        
+
         Args:
             db: Database session
             task_id: Task ID
             task_data: Update data
-            
+
         Returns:
             Updated task
-            
+
         Raises:
             TaskNotFoundException: If task not found
         """
-        task = TaskService.get_task(db, task_id)
-        
         # Update only provided fields
         update_data = task_data.model_dump(exclude_unset=True)
-        
-        for field, value in update_data.items():
-            setattr(task, field, value)
-        
-        db.commit()
-        db.refresh(task)
-        
+
+        if not update_data:
+            return await TaskService.get_task(db, task_id)
+
+        return await TaskService._update_fields(db, task_id, update_data)
+
+    @staticmethod
+    async def _update_fields(db: AsyncSession, task_id: int, values: dict) -> Task:
+        """
+        Apply a single UPDATE ... RETURNING statement to a task.
+
+        Args:
+            db: Database session
+            task_id: Task ID
+            values: Column values to set
+
+        Returns:
+            Updated task
+
+        Raises:
+            TaskNotFoundException: If task not found
+            TaskValidationException: If a non-updatable field is passed
+        """
+        unknown = values.keys() - _UPDATABLE_FIELDS
+        if unknown:
+            raise TaskValidationException(
+                f"Cannot update fields: {', '.join(sorted(unknown))}"
+            )
+
+        result = await db.execute(
+            update(Task)
+            .where(Task.id == task_id)
+            .values(**values)
+            .returning(Task)
+        )
+        task = result.scalar_one_or_none()
+
+        if task is None:
+            raise TaskNotFoundException(task_id)
+
+        await db.commit()
+
         return task
-    
+
     @staticmethod
-    def update_task_status(db: Session, task_id: int, status: TaskStatus) -> Task:
+    async def update_task_status(db: AsyncSession, task_id: int, status: TaskStatus) -> Task:
         """
         Update task status.
-        
+
         Args:
             db: Database session
             task_id: Task ID
             status: New status
-            
+
         Returns:
             Updated task
         """
-        task = TaskService.get_task(db, task_id)
-        task.status = status
-        
-        db.commit()
-        db.refresh(task)
-        
-        return task
-    
+        return await TaskService._update_fields(db, task_id, {"status": status})
+
     @staticmethod
-    def update_task_priority(db: Session, task_id: int, priority: TaskPriority) -> Task:
+    async def update_task_priority(db: AsyncSession, task_id: int, priority: TaskPriority) -> Task:
         """
         Update task priority.
-        
+
         Args:
             db: Database session
             task_id: Task ID
             priority: New priority
-            
+
         Returns:
             Updated task
         """
-        task = TaskService.get_task(db, task_id)
-        task.priority = priority
-        
-        db.commit()
-        db.refresh(task)
-        
-        return task
-    
+        return await TaskService._update_fields(db, task_id, {"priority": priority})
+
     @staticmethod
-    def delete_task(db: Session, task_id: int) -> None:
+    async def delete_task(db: AsyncSession, task_id: int) -> None:
         """
         Delete a task.
-        
+
         Args:
             db: Database session
             task_id: Task ID
-            
+
         Raises:
             TaskNotFoundException: If task not found
         """
-        task = TaskService.get_task(db, task_id)
-        
-        db.delete(task)
-        db.commit()
-    
+        result = await db.execute(delete(Task).where(Task.id == task_id))
+
+        if result.rowcount == 0:
+            raise TaskNotFoundException(task_id)
+
+        await db.commit()
+
     @staticmethod
-    def search_tasks(
-        db: Session,
+    async def search_tasks(
+        db: AsyncSession,
         query: str,
         skip: int = 0,
-        limit: int = 100
-    ) -> tuple[List[Task], int]:
+        limit: int = 100,
+        with_total: bool = False
+    ) -> tuple[List[Task], Optional[int]]:
         """
         Search tasks by title or description.
-        
+
         Args:
             db: Database session
             query: Search query
             skip: Number of records to skip
             limit: Maximum records to return
-            
+            with_total: Whether to also count matching rows
+
         Returns:
-            Tuple of (tasks list, total count)
+            Tuple of (tasks list, total count or None)
         """
-        search_filter = (
-            Task.title.ilike(f"%{query}%") |
-            Task.description.ilike(f"%{query}%")
+        stmt = TaskService._search_stmt(db, query)
+
+        total = None
+        if with_total:
+            total = await TaskService._count(db, stmt)
+
+        result = await db.execute(
+            stmt.order_by(Task.created_at.desc()).offset(skip).limit(limit)
         )
-        
-        query_obj = db.query(Task).filter(search_filter)
-        total = query_obj.count()
-        
-        tasks = query_obj.order_by(Task.created_at.desc()).offset(skip).limit(limit).all()
-        
+        tasks = list(result.scalars().all())
+
         return tasks, total
-    
+
     @staticmethod
-    def get_task_statistics(db: Session) -> dict:
+    async def stream_search(
+        db: AsyncSession,
+        query: str,
+        skip: int = 0,
+        limit: int = 100,
+        with_total: bool = False
+    ) -> tuple[AsyncIterator[Task], Optional[int]]:
+        """
+        Stream search results instead of materializing them.
+
+        Args:
+            db: Database session
+            query: Search query
+            skip: Number of records to skip
+            limit: Maximum records to return
+            with_total: Whether to also count matching rows
+
+        Returns:
+            Tuple of (async task iterator, total count or None)
+        """
+        stmt = TaskService._search_stmt(db, query)
+
+        total = None
+        if with_total:
+            total = await TaskService._count(db, stmt)
+
+        result = await db.stream(
+            stmt.order_by(Task.created_at.desc())
+            .offset(skip)
+            .limit(limit)
+            .execution_options(yield_per=STREAM_CHUNK_SIZE)
+        )
+
+        return result.scalars(), total
+
+    @staticmethod
+    async def get_task_statistics(db: AsyncSession) -> dict:
         """
         Get task statistics.
-        
+
         Args:
             db: Database session
-            
+
         Returns:
             Dictionary with statistics
         """
-        total_tasks = db.query(Task).count()
-        pending = db.query(Task).filter(Task.status == TaskStatus.PENDING).count()
-        in_progress = db.query(Task).filter(Task.status == TaskStatus.IN_PROGRESS).count()
-        completed = db.query(Task).filter(Task.status == TaskStatus.COMPLETED).count()
-        
-        high_priority = db.query(Task).filter(Task.priority == TaskPriority.HIGH).count()
-        medium_priority = db.query(Task).filter(Task.priority == TaskPriority.MEDIUM).count()
-        low_priority = db.query(Task).filter(Task.priority == TaskPriority.LOW).count()
-        
+        # Two grouped scans instead of one COUNT query per bucket.
+        status_rows = await db.execute(
+            select(Task.status, func.count()).group_by(Task.status)
+        )
+        priority_rows = await db.execute(
+            select(Task.priority, func.count()).group_by(Task.priority)
+        )
+
+        status_counts = {status: count for status, count in status_rows}
+        priority_counts = {priority: count for priority, count in priority_rows}
+
         return {
-            "total_tasks": total_tasks,
+            "total_tasks": sum(status_counts.values()),
             "by_status": {
-                "pending": pending,
-                "in_progress": in_progress,
-                "completed": completed
+                status.value: status_counts.get(status, 0)
+                for status in TaskStatus
             },
             "by_priority": {
-                "high": high_priority,
-                "medium": medium_priority,
-                "low": low_priority
+                priority.value: priority_counts.get(priority, 0)
+                for priority in TaskPriority
             }
         }
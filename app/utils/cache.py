@@ -0,0 +1,100 @@
+"""
+Response cache helpers.
+Wires fastapi-cache to Redis (or process memory) for hot read endpoints.
+"""
+
+import logging
+from typing import Any, Callable, Optional
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def request_key_builder(
+    func: Callable,
+    namespace: str = "",
+    *,
+    request: Optional[Request] = None,
+    response: Optional[Response] = None,
+    args: Optional[tuple] = None,
+    kwargs: Optional[dict] = None,
+) -> str:
+    """
+    Build a cache key from the request path and query parameters.
+
+    The default key builder hashes endpoint kwargs, which include the
+    database session and therefore never repeat; keying on the URL gives
+    identical requests identical keys.
+    """
+    return ":".join([
+        FastAPICache.get_prefix(),
+        namespace,
+        request.method.lower(),
+        request.url.path,
+        repr(sorted(request.query_params.multi_items())),
+    ])
+
+
+def params_key_builder(
+    func: Callable,
+    namespace: str = "",
+    *,
+    request: Optional[Request] = None,
+    response: Optional[Response] = None,
+    args: Optional[tuple] = None,
+    kwargs: Optional[dict] = None,
+) -> str:
+    """
+    Build a cache key from a helper function's keyword arguments.
+
+    For cached helpers that are called outside the routing layer and so
+    have no request to key on. The database session kwarg is excluded
+    because it differs on every call.
+    """
+    params = {k: v for k, v in (kwargs or {}).items() if k != "db"}
+    return ":".join([
+        FastAPICache.get_prefix(),
+        namespace,
+        func.__module__,
+        func.__qualname__,
+        repr(sorted(params.items())),
+    ])
+
+
+def init_cache() -> None:
+    """Initialize the cache backend (Redis if configured, else in-process)."""
+    if settings.redis_url:
+        from fastapi_cache.backends.redis import RedisBackend
+        from redis import asyncio as aioredis
+
+        backend: Any = RedisBackend(aioredis.from_url(settings.redis_url))
+    else:
+        backend = InMemoryBackend()
+        if settings.workers > 1:
+            # Invalidation after writes only reaches the worker that
+            # handled the write; the others keep serving cached pages.
+            logger.warning(
+                "In-process response cache with %d workers: a write in one "
+                "worker does not invalidate the others, which may serve "
+                "stale responses for up to %ds. Set redis_url to share the "
+                "cache across workers.",
+                settings.workers,
+                settings.cache_ttl,
+            )
+
+    FastAPICache.init(
+        backend,
+        prefix="task-manager-cache",
+        key_builder=request_key_builder,
+    )
+
+
+async def invalidate_cache() -> None:
+    """Drop all cached responses; called after every write."""
+    await FastAPICache.clear()
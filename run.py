@@ -11,6 +11,9 @@ if __name__ == "__main__":
         "app.main:app",
         host=settings.host,
         port=settings.port,
-        reload=settings.debug,
+        workers=settings.workers,
+        loop=settings.loop,
+        http=settings.http,
+        reload=settings.debug and settings.workers == 1,
         log_level="info"
     )
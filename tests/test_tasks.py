@@ -2,45 +2,207 @@
 Tests for task endpoints.
 """
 
+import asyncio
+import contextlib
+
+import httpx
+import orjson
 import pytest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
 
 from app.main import app
 from app.database.session import Base, get_db
-from app.models.task import TaskStatus, TaskPriority
-
-# Test database
-SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
-engine = create_engine(SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-def override_get_db():
-    """Override database dependency for testing."""
-    try:
-        db = TestingSessionLocal()
-        yield db
-    finally:
-        db.close()
-
-
-app.dependency_overrides[get_db] = override_get_db
-
-
-@pytest.fixture(scope="function")
-def client():
-    """Create test client."""
-    Base.metadata.create_all(bind=engine)
-    yield TestClient(app)
-    Base.metadata.drop_all(bind=engine)
-
-
-def test_create_task(client):
+from app.utils.cache import invalidate_cache
+from app.models.task import Task, TaskStatus, TaskPriority
+
+# Test database: in-memory SQLite on a StaticPool, so the whole suite
+# shares one RAM-resident connection and never touches the filesystem.
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite://"
+engine = create_async_engine(
+    SQLALCHEMY_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+TestingSessionLocal = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+
+# The sqlite driver commits behind SQLAlchemy's back unless its implicit
+# transaction handling is disabled; without these hooks the SAVEPOINTs
+# the client fixture relies on are silently no-ops (see the "Serializable
+# isolation / Savepoints" section of the SQLAlchemy SQLite docs).
+@event.listens_for(engine.sync_engine, "connect")
+def _disable_implicit_begin(dbapi_connection, _record):
+    dbapi_connection.isolation_level = None
+    # Durability is irrelevant in tests: skip fsyncs and keep the journal
+    # and temp structures in RAM (no-ops for the in-memory database, but
+    # they keep the suite fast should the URL ever point at a file again).
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA synchronous=OFF")
+    cursor.execute("PRAGMA journal_mode=MEMORY")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+@event.listens_for(engine.sync_engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+# Endpoint URLs used throughout the module
+TASKS_URL = "/api/v1/tasks"
+SEARCH_URL = TASKS_URL + "/search"
+STATS_URL = TASKS_URL + "/statistics"
+
+def j(response):
+    """Parse a response body with orjson instead of stdlib json."""
+    return orjson.loads(response.content)
+
+
+# Static setup bodies, serialized once at import; sending content= with
+# an explicit content-type skips httpx's per-call JSON encoding.
+_JSON = {"content-type": "application/json"}
+_SPECIFIC_TASK_BODY = orjson.dumps({"title": "Specific Task"})
+_DELETE_TASK_BODY = orjson.dumps({"title": "Task to Delete"})
+
+# The session serving the current test. Every request within a test
+# shares it, so SQLAlchemy's identity map answers repeat lookups (create
+# then get-by-id) without extra SELECTs. Bound by db_transaction.
+_active_session = None
+
+
+async def override_get_db():
+    """Yield the current test's shared session; its fixture owns closing it."""
+    if _active_session is None:
+        async with TestingSessionLocal() as db:
+            yield db
+    else:
+        yield _active_session
+
+
+@pytest.fixture(scope="session", autouse=True)
+def override_db_dependency():
+    """Point get_db at the test engine for this session, then restore.
+
+    Installing the override in a fixture rather than at import keeps the
+    app's global state untouched for other test modules and collection.
+    """
+    app.dependency_overrides[get_db] = override_get_db
+    yield
+    app.dependency_overrides.pop(get_db, None)
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """One event loop for the whole suite, so session fixtures can be async."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def schema():
+    """Build the schema once for the whole suite instead of per test.
+
+    No drop_all teardown: the in-memory database dies with the process,
+    so issuing DROP TABLE DDL on the way out is pure waste.
+    """
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def client():
+    """One test client for the whole suite; per-test state lives in the DB."""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test"
+    ) as ac:
+        yield ac
+
+
+@contextlib.asynccontextmanager
+async def _rolled_back_transaction():
+    """Serve requests from one shared session, then roll everything back.
+
+    The session joins the connection-level transaction as savepoints, so
+    the app can commit freely; the rollback on exit erases everything
+    written inside the block without any DDL or DELETEs.
+    """
+    global _active_session
+
+    # Direct-insert seeding never passes the write endpoints, so nothing
+    # calls invalidate_cache(); start cold so no test reads a page cached
+    # against another test's (rolled-back) data.
+    await invalidate_cache()
+
+    async with engine.connect() as conn:
+        trans = await conn.begin()
+        session = async_sessionmaker(
+            bind=conn,
+            autoflush=False,
+            expire_on_commit=False,
+            join_transaction_mode="create_savepoint",
+        )()
+        _active_session = session
+        try:
+            yield
+        finally:
+            _active_session = None
+            await session.close()
+            await trans.rollback()
+
+
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def warmup(override_db_dependency, schema, client):
+    """Touch every route once before the suite runs.
+
+    FastAPI compiles request/response validators lazily on each route's
+    first hit; doing that here keeps the cost out of whichever test
+    happens to reach an endpoint first.
+    """
+    async with _rolled_back_transaction():
+        created = await client.post(TASKS_URL, json={"title": "Warmup"})
+        task_id = j(created)["id"]
+        await client.post(TASKS_URL + "/bulk", json=[{"title": "Warmup"}])
+        await client.get(f"{TASKS_URL}?limit=1")
+        await client.get(f"{SEARCH_URL}?q=warmup")
+        await client.get(STATS_URL)
+        await client.get(f"{TASKS_URL}/{task_id}")
+        await client.put(f"{TASKS_URL}/{task_id}", json={"title": "Warmup"})
+        await client.patch(
+            f"{TASKS_URL}/{task_id}/status", json={"status": "completed"}
+        )
+        await client.patch(
+            f"{TASKS_URL}/{task_id}/priority", json={"priority": "low"}
+        )
+        await client.delete(f"{TASKS_URL}/{task_id}")
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def db_transaction():
+    """Run each test inside one rolled-back connection-level transaction."""
+    async with _rolled_back_transaction():
+        yield
+
+
+async def seed_tasks(rows):
+    """Insert seed rows directly, bypassing HTTP, validation and routing.
+
+    Uses the test's shared session, so the rows join its transaction and
+    vanish with the teardown rollback.
+    """
+    tasks = [Task(**row) for row in rows]
+    _active_session.add_all(tasks)
+    await _active_session.commit()
+    return tasks
+
+
+async def test_create_task(client):
     """Test creating a new task."""
-    response = client.post(
-        "/api/v1/tasks",
+    response = await client.post(
+        TASKS_URL,
         json={
             "title": "Test Task",
             "description": "Test Description",
@@ -49,7 +211,7 @@ def test_create_task(client):
         }
     )
     assert response.status_code == 201
-    data = response.json()
+    data = j(response)
     assert data["title"] == "Test Task"
     assert data["description"] == "Test Description"
     assert data["status"] == "pending"
@@ -59,206 +221,291 @@ def test_create_task(client):
     assert "updated_at" in data
 
 
-def test_get_tasks(client):
+async def test_bulk_create_tasks(client):
+    """Test creating multiple tasks in one request."""
+    response = await client.post(
+        TASKS_URL + "/bulk",
+        json=[
+            {"title": "Bulk Task 1", "priority": "high"},
+            {"title": "Bulk Task 2", "status": "in_progress"}
+        ]
+    )
+    assert response.status_code == 201
+    data = j(response)
+    assert len(data) == 2
+    assert data[0]["title"] == "Bulk Task 1"
+    assert data[0]["priority"] == "high"
+    assert data[1]["status"] == "in_progress"
+    assert all("id" in task for task in data)
+
+
+async def test_bulk_create_tasks_empty(client):
+    """Test that an empty bulk request creates nothing and succeeds."""
+    response = await client.post(TASKS_URL + "/bulk", json=[])
+    assert response.status_code == 201
+    assert j(response) == []
+
+
+async def test_get_tasks(client):
     """Test getting all tasks."""
-    # Create some tasks
-    client.post("/api/v1/tasks", json={"title": "Task 1", "status": "pending"})
-    client.post("/api/v1/tasks", json={"title": "Task 2", "status": "in_progress"})
-    
+    # Seed some tasks
+    await seed_tasks([
+        {"title": "Task 1", "status": "pending"},
+        {"title": "Task 2", "status": "in_progress"},
+    ])
+
     # Get all tasks
-    response = client.get("/api/v1/tasks")
+    response = await client.get(f"{TASKS_URL}?with_total=true")
     assert response.status_code == 200
-    data = response.json()
+    data = j(response)
     assert data["total"] == 2
     assert len(data["tasks"]) == 2
 
 
-def test_get_task_by_id(client):
+async def test_get_task_by_id(client):
     """Test getting a specific task."""
     # Create a task
-    create_response = client.post(
-        "/api/v1/tasks",
-        json={"title": "Specific Task"}
+    create_response = await client.post(
+        TASKS_URL, content=_SPECIFIC_TASK_BODY, headers=_JSON
     )
-    task_id = create_response.json()["id"]
-    
+    task_id = j(create_response)["id"]
+
     # Get the task
-    response = client.get(f"/api/v1/tasks/{task_id}")
+    response = await client.get(f"{TASKS_URL}/{task_id}")
     assert response.status_code == 200
-    data = response.json()
+    data = j(response)
     assert data["id"] == task_id
     assert data["title"] == "Specific Task"
 
 
-def test_get_nonexistent_task(client):
+async def test_get_nonexistent_task(client):
     """Test getting a task that doesn't exist."""
-    response = client.get("/api/v1/tasks/9999")
+    response = await client.get(f"{TASKS_URL}/9999")
     assert response.status_code == 404
-    assert "not found" in response.json()["detail"].lower()
-
-
-def test_update_task(client):
-    """Test updating a task."""
-    # Create a task
-    create_response = client.post(
-        "/api/v1/tasks",
-        json={"title": "Original Title", "status": "pending"}
-    )
-    task_id = create_response.json()["id"]
-    
-    # Update the task
-    response = client.put(
-        f"/api/v1/tasks/{task_id}",
-        json={"title": "Updated Title", "status": "completed"}
-    )
-    assert response.status_code == 200
-    data = response.json()
-    assert data["title"] == "Updated Title"
-    assert data["status"] == "completed"
-
-
-def test_update_task_status(client):
-    """Test updating only task status."""
-    # Create a task
-    create_response = client.post(
-        "/api/v1/tasks",
-        json={"title": "Task", "status": "pending"}
-    )
-    task_id = create_response.json()["id"]
-    
-    # Update status
-    response = client.patch(
-        f"/api/v1/tasks/{task_id}/status",
-        json={"status": "completed"}
+    assert "not found" in j(response)["detail"].lower()
+
+
+@pytest.mark.parametrize(
+    "method,suffix,body,expected",
+    [
+        (
+            "put", "",
+            orjson.dumps({"title": "Updated Title", "status": "completed"}),
+            {"title": "Updated Title", "status": "completed"},
+        ),
+        (
+            "patch", "/status",
+            orjson.dumps({"status": "completed"}),
+            {"status": "completed"},
+        ),
+        (
+            "patch", "/priority",
+            orjson.dumps({"priority": "high"}),
+            {"priority": "high"},
+        ),
+    ],
+    ids=["put-full", "patch-status", "patch-priority"],
+)
+async def test_update_task_fields(client, method, suffix, body, expected):
+    """Test full and single-field task updates."""
+    # Seed the task to update
+    task = (await seed_tasks([
+        {"title": "Task", "status": "pending", "priority": "low"}
+    ]))[0]
+
+    response = await client.request(
+        method, f"{TASKS_URL}/{task.id}{suffix}", content=body, headers=_JSON
     )
     assert response.status_code == 200
-    assert response.json()["status"] == "completed"
+    data = j(response)
+    for key, value in expected.items():
+        assert data[key] == value
 
 
-def test_update_task_priority(client):
-    """Test updating only task priority."""
-    # Create a task
-    create_response = client.post(
-        "/api/v1/tasks",
-        json={"title": "Task", "priority": "low"}
-    )
-    task_id = create_response.json()["id"]
-    
-    # Update priority
-    response = client.patch(
-        f"/api/v1/tasks/{task_id}/priority",
-        json={"priority": "high"}
-    )
-    assert response.status_code == 200
-    assert response.json()["priority"] == "high"
-
-
-def test_delete_task(client):
+async def test_delete_task(client):
     """Test deleting a task."""
     # Create a task
-    create_response = client.post(
-        "/api/v1/tasks",
-        json={"title": "Task to Delete"}
+    create_response = await client.post(
+        TASKS_URL, content=_DELETE_TASK_BODY, headers=_JSON
     )
-    task_id = create_response.json()["id"]
-    
+    task_id = j(create_response)["id"]
+
     # Delete the task
-    response = client.delete(f"/api/v1/tasks/{task_id}")
+    response = await client.delete(f"{TASKS_URL}/{task_id}")
     assert response.status_code == 204
-    
+
     # Verify it's deleted
-    get_response = client.get(f"/api/v1/tasks/{task_id}")
+    get_response = await client.get(f"{TASKS_URL}/{task_id}")
     assert get_response.status_code == 404
 
 
-def test_filter_tasks_by_status(client):
+async def test_filter_tasks_by_status(client):
     """Test filtering tasks by status."""
-    # Create tasks with different statuses
-    client.post("/api/v1/tasks", json={"title": "Pending Task", "status": "pending"})
-    client.post("/api/v1/tasks", json={"title": "Completed Task", "status": "completed"})
-    
+    # Seed tasks with different statuses
+    await seed_tasks([
+        {"title": "Pending Task", "status": "pending"},
+        {"title": "Completed Task", "status": "completed"},
+    ])
+
     # Filter by pending
-    response = client.get("/api/v1/tasks?status=pending")
+    response = await client.get(f"{TASKS_URL}?status=pending&with_total=true")
     assert response.status_code == 200
-    data = response.json()
+    data = j(response)
     assert data["total"] == 1
     assert data["tasks"][0]["status"] == "pending"
 
 
-def test_filter_tasks_by_priority(client):
+async def test_filter_tasks_by_priority(client):
     """Test filtering tasks by priority."""
-    # Create tasks with different priorities
-    client.post("/api/v1/tasks", json={"title": "High Priority", "priority": "high"})
-    client.post("/api/v1/tasks", json={"title": "Low Priority", "priority": "low"})
-    
+    # Seed tasks with different priorities
+    await seed_tasks([
+        {"title": "High Priority", "priority": "high"},
+        {"title": "Low Priority", "priority": "low"},
+    ])
+
     # Filter by high priority
-    response = client.get("/api/v1/tasks?priority=high")
+    response = await client.get(f"{TASKS_URL}?priority=high&with_total=true")
     assert response.status_code == 200
-    data = response.json()
+    data = j(response)
     assert data["total"] == 1
     assert data["tasks"][0]["priority"] == "high"
 
 
-def test_search_tasks(client):
+async def test_search_tasks(client):
     """Test searching tasks."""
-    # Create tasks
-    client.post("/api/v1/tasks", json={"title": "Important Meeting", "description": "Discuss project"})
-    client.post("/api/v1/tasks", json={"title": "Buy groceries", "description": "Get milk and eggs"})
-    
+    # Seed tasks
+    await seed_tasks([
+        {"title": "Important Meeting", "description": "Discuss project"},
+        {"title": "Buy groceries", "description": "Get milk and eggs"},
+    ])
+
     # Search for "meeting"
-    response = client.get("/api/v1/tasks/search?q=meeting")
+    response = await client.get(f"{SEARCH_URL}?q=meeting&with_total=true")
     assert response.status_code == 200
-    data = response.json()
+    data = j(response)
     assert data["total"] == 1
     assert "meeting" in data["tasks"][0]["title"].lower()
 
 
-def test_pagination(client):
+async def test_pagination(client):
     """Test task pagination."""
-    # Create 5 tasks
-    for i in range(5):
-        client.post("/api/v1/tasks", json={"title": f"Task {i}"})
-    
+    # Seed 5 tasks
+    await seed_tasks([{"title": f"Task {i}"} for i in range(5)])
+
     # Get first 2 tasks
-    response = client.get("/api/v1/tasks?skip=0&limit=2")
+    response = await client.get(f"{TASKS_URL}?skip=0&limit=2&with_total=true")
     assert response.status_code == 200
-    data = response.json()
+    data = j(response)
     assert len(data["tasks"]) == 2
     assert data["total"] == 5
-    
+
     # Get next 2 tasks
-    response = client.get("/api/v1/tasks?skip=2&limit=2")
+    response = await client.get(f"{TASKS_URL}?skip=2&limit=2")
+    assert response.status_code == 200
+    data = j(response)
+    assert len(data["tasks"]) == 2
+
+
+async def test_cursor_pagination(client):
+    """Test keyset pagination via next_cursor."""
+    await seed_tasks([{"title": f"Cursor Task {i}"} for i in range(5)])
+
+    # First page
+    response = await client.get(f"{TASKS_URL}?limit=2")
+    assert response.status_code == 200
+    data = j(response)
+    assert len(data["tasks"]) == 2
+    assert data["next_cursor"] is not None
+    first_ids = {task["id"] for task in data["tasks"]}
+
+    # Follow the cursor; total stays the full match count on later pages
+    response = await client.get(
+        f"{TASKS_URL}?limit=2&with_total=true&cursor={data['next_cursor']}"
+    )
     assert response.status_code == 200
-    data = response.json()
+    data = j(response)
     assert len(data["tasks"]) == 2
+    assert data["total"] == 5
+    assert first_ids.isdisjoint(task["id"] for task in data["tasks"])
+
+    # A malformed cursor is rejected
+    response = await client.get(f"{TASKS_URL}?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
+async def test_get_tasks_streaming_limit(client):
+    """Test that large-limit list requests stream a valid response."""
+    await seed_tasks([{"title": f"Stream Task {i}"} for i in range(3)])
+
+    response = await client.get(f"{TASKS_URL}?limit=300&with_total=true")
+    assert response.status_code == 200
+    data = j(response)
+    assert len(data["tasks"]) == 3
+    assert data["total"] == 3
+    assert data["limit"] == 300
+    # Fewer rows than the limit: no further page
+    assert data["next_cursor"] is None
 
 
-def test_get_statistics(client):
+async def test_streaming_next_cursor(client):
+    """Test that a full streamed page carries a cursor to the next one."""
+    await seed_tasks([{"title": f"Stream Task {i}"} for i in range(303)])
+
+    response = await client.get(f"{TASKS_URL}?limit=300")
+    data = j(response)
+    assert len(data["tasks"]) == 300
+    assert data["next_cursor"] is not None
+
+    # The cursor continues where the stream stopped
+    response = await client.get(f"{TASKS_URL}?limit=300&cursor={data['next_cursor']}")
+    data = j(response)
+    assert len(data["tasks"]) == 3
+    assert data["next_cursor"] is None
+
+
+async def test_get_statistics(client):
     """Test getting task statistics."""
-    # Create tasks with different statuses and priorities
-    client.post("/api/v1/tasks", json={"status": "pending", "priority": "high"})
-    client.post("/api/v1/tasks", json={"status": "completed", "priority": "low"})
-    client.post("/api/v1/tasks", json={"status": "in_progress", "priority": "medium"})
-    
-    response = client.get("/api/v1/tasks/statistics")
+    # Seed tasks with different statuses and priorities
+    await seed_tasks([
+        {"title": "Stats 1", "status": "pending", "priority": "high"},
+        {"title": "Stats 2", "status": "completed", "priority": "low"},
+        {"title": "Stats 3", "status": "in_progress", "priority": "medium"},
+    ])
+
+    response = await client.get(STATS_URL)
     assert response.status_code == 200
-    data = response.json()
+    data = j(response)
     assert data["total_tasks"] == 3
     assert "by_status" in data
     assert "by_priority" in data
 
 
-def test_validation_error(client):
+async def test_validation_error(client):
     """Test validation error handling."""
     # Try to create task without title
-    response = client.post("/api/v1/tasks", json={"description": "No title"})
+    response = await client.post(TASKS_URL, json={"description": "No title"})
     assert response.status_code == 422
 
 
-def test_invalid_status(client):
+async def test_invalid_status(client):
     """Test invalid status value."""
-    response = client.post(
-        "/api/v1/tasks",
+    response = await client.post(
+        TASKS_URL,
         json={"title": "Task", "status": "invalid_status"}
     )
     assert response.status_code == 422
+
+
+async def test_all_endpoints_are_async():
+    """Every task endpoint must be a coroutine function.
+
+    The app runs sync SQLAlchemy nowhere anymore; a sync handler calling
+    the async session layer would be pushed to the threadpool and can
+    deadlock under load, so guard against one being reintroduced.
+    """
+    from app.api.routes.tasks import router
+
+    for route in router.routes:
+        assert asyncio.iscoroutinefunction(route.endpoint), (
+            f"{route.path} handler {route.endpoint.__name__} is not async"
+        )